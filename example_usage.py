@@ -49,7 +49,7 @@ def basic_usage_example():
     finally:
         # Cleanup
         if 'bot' in locals():
-            bot._cleanup()
+            bot.shutdown()
 
 def analytics_example():
     """Example of generating analytics reports."""
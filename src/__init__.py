@@ -8,10 +8,9 @@ Author: Instagram Bot Project
 Version: 1.0.0
 """
 
-from .instagram_bot import InstagramBot
-from .engagement import EngagementStrategy
-from .analytics import AnalyticsManager
-from .utils import ConfigManager, Logger, RateLimiter
+from importlib import import_module
+
+from .utils import Config, ConfigManager, Logger, RateLimiter
 
 __version__ = "1.0.0"
 __author__ = "Instagram Bot Project"
@@ -20,7 +19,22 @@ __all__ = [
     'InstagramBot',
     'EngagementStrategy', 
     'AnalyticsManager',
+    'Config',
     'ConfigManager',
     'Logger',
     'RateLimiter'
-]
\ No newline at end of file
+]
+
+# Heavy modules (selenium, pandas, matplotlib) are imported on first access
+_LAZY_EXPORTS = {
+    'InstagramBot': '.instagram_bot',
+    'EngagementStrategy': '.engagement',
+    'AnalyticsManager': '.analytics',
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,29 +1,85 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, TextIO
+import atexit
+import csv
+import hashlib
 import os
+import time
 from utils import DataManager, Logger
 
+# pandas and matplotlib are imported on first use to keep package import fast
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Column types of sessions.csv, declared so pandas skips type inference on read
+SESSION_DTYPES = {
+    'likes_count': 'int32',
+    'follows_count': 'int32',
+    'comments_count': 'int32',
+    'duration_minutes': 'float32',
+    'success_rate': 'float32',
+    'target_hashtags': 'category'
+}
+ACTION_FIELDS = ['timestamp', 'action_type', 'target', 'success', 'details']
+COUNT_COLUMNS = ['likes_count', 'follows_count', 'comments_count']
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 class AnalyticsManager:
     """Manages analytics and reporting for Instagram bot activities."""
     
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, flush_threshold: int = 64, flush_interval: float = 5.0,
+                 cache_ttl: float = 60.0):
         self.logger = logger
         self.data_manager = DataManager()
         self.analytics_dir = "data/analytics"
         os.makedirs(self.analytics_dir, exist_ok=True)
+        
+        # Rows are buffered in memory and written in batches
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self._session_buffer: List[Dict[str, Any]] = []
+        
+        # Actions are written straight to a held, block-buffered file handle
+        self._actions_path = f"{self.analytics_dir}/actions.csv"
+        self._actions_file: Optional[TextIO] = None
+        self._actions_writer: Optional[csv.DictWriter] = None
+        self._pending_actions = 0
+        self._last_flush_ts = time.monotonic()
+        atexit.register(self._flush_all)
+        
+        # Parsed sessions history, refreshed from the CSV tail on demand
+        self.cache_ttl = cache_ttl
+        self._sessions_path = f"{self.analytics_dir}/sessions.csv"
+        self._sessions_cache: Optional['pd.DataFrame'] = None
+        self._ts_ns = np.empty(0, dtype=np.int64)
+        self._sessions_columns: List[str] = []
+        self._sessions_offset = 0
+        self._sessions_mtime = None
+        # Identity of the parsed file: inode plus a hash of its header and last parsed line
+        self._sessions_ino = None
+        self._sessions_fingerprint = None
+        self._sessions_checked_at = 0.0
+        self._sessions_dirty = True
+        
+        # Typed Parquet snapshot of the parsed history, used to skip CSV parsing on cold start
+        self._snapshot_path = f"{self.analytics_dir}/sessions.parquet"
+        self._snapshot_meta_path = f"{self.analytics_dir}/sessions.parquet.json"
+        
+        # (parsed file inode, mtime, offset, dpi) and path of the last rendered chart
+        self._chart_cache = None
+        self._chart_figure = None
     
     def record_session(self, session_data: Dict[str, Any]):
         """Record a bot session with metrics."""
         session_data['timestamp'] = datetime.now().isoformat()
         
-        # Save to CSV
-        csv_path = f"{self.analytics_dir}/sessions.csv"
-        self.data_manager.append_to_csv([session_data], csv_path)
+        self._session_buffer.append(session_data)
+        self._maybe_flush()
         
-        self.logger.info(f"Session recorded: {session_data}")
+        self.logger.info("Session recorded: %d likes, %d follows, %d comments",
+                         session_data['likes_count'], session_data['follows_count'], session_data['comments_count'])
+        self.logger.debug("Session data: %s", session_data)
     
     def record_action(self, action_type: str, target: str, success: bool, details: Dict[str, Any] = None):
         """Record individual actions."""
@@ -35,8 +91,177 @@ class AnalyticsManager:
             'details': str(details) if details else ''
         }
         
-        csv_path = f"{self.analytics_dir}/actions.csv"
-        self.data_manager.append_to_csv([action_data], csv_path)
+        if self._actions_writer is None:
+            self._open_actions_writer()
+        self._actions_writer.writerow(action_data)
+        self._pending_actions += 1
+        self._maybe_flush()
+    
+    def _open_actions_writer(self):
+        """Open actions.csv for appending and write the header if the file is new."""
+        self._actions_file = open(self._actions_path, 'a', newline='', buffering=1 << 16)
+        self._actions_writer = csv.DictWriter(self._actions_file, fieldnames=ACTION_FIELDS)
+        if self._actions_file.tell() == 0:
+            self._actions_writer.writeheader()
+    
+    def _maybe_flush(self):
+        """Flush buffered rows once the size or time threshold is reached."""
+        pending = self._pending_actions + len(self._session_buffer)
+        if pending >= self.flush_threshold or time.monotonic() - self._last_flush_ts > self.flush_interval:
+            self._flush_all()
+    
+    def _flush_all(self):
+        """Write all buffered rows to their CSV files."""
+        if self._actions_file is not None:
+            self._actions_file.flush()
+            self._pending_actions = 0
+        if self._session_buffer:
+            self.data_manager.append_to_csv(self._session_buffer, self._sessions_path)
+            self._session_buffer = []
+            self._sessions_dirty = True
+        self._last_flush_ts = time.monotonic()
+    
+    def _load_sessions(self) -> 'pd.DataFrame':
+        """Return the parsed sessions history, reading only rows appended since the last load."""
+        import pandas as pd
+        from pandas.api.types import union_categoricals
+        self._flush_all()
+        
+        now = time.monotonic()
+        if (self._sessions_cache is not None and not self._sessions_dirty
+                and now - self._sessions_checked_at < self.cache_ttl):
+            return self._sessions_cache
+        
+        stat = os.stat(self._sessions_path)
+        self._sessions_checked_at = now
+        self._sessions_dirty = False
+        
+        cold_start = self._sessions_cache is None
+        if cold_start:
+            self._restore_snapshot(stat)
+        
+        if self._sessions_cache is not None and stat.st_ino == self._sessions_ino \
+                and stat.st_mtime == self._sessions_mtime and stat.st_size == self._sessions_offset:
+            return self._sessions_cache
+        
+        with open(self._sessions_path, 'rb') as f:
+            new_rows = None
+            if self._sessions_cache is not None and self._is_appended_to(f, stat):
+                f.seek(self._sessions_offset)
+                try:
+                    new_rows = pd.read_csv(f, header=None, names=self._sessions_columns, dtype=SESSION_DTYPES,
+                                           parse_dates=['timestamp'], date_format='ISO8601', engine='c')
+                except ValueError as e:
+                    self.logger.warning("Could not read appended sessions, reparsing the history: %s", e)
+            
+            if new_rows is None:
+                # First load, or the file was replaced or rewritten: parse everything
+                f.seek(0)
+                new_rows = pd.read_csv(f, dtype=SESSION_DTYPES, parse_dates=['timestamp'],
+                                       date_format='ISO8601', engine='c')
+                self._sessions_columns = list(new_rows.columns)
+                self._sessions_cache = None
+            self._sessions_offset = f.tell()
+            self._sessions_fingerprint = self._file_fingerprint(f, self._sessions_offset)
+        self._sessions_mtime = stat.st_mtime
+        self._sessions_ino = stat.st_ino
+        
+        # parse_dates leaves a header-only file's timestamp column as object dtype
+        if not pd.api.types.is_datetime64_any_dtype(new_rows['timestamp']):
+            new_rows['timestamp'] = pd.to_datetime(new_rows['timestamp'], format='ISO8601')
+        new_rows['weekday'] = new_rows['timestamp'].dt.dayofweek
+        
+        if self._sessions_cache is None or self._sessions_cache.empty:
+            self._set_sessions_cache(new_rows)
+        elif not new_rows.empty:
+            combined = pd.concat([self._sessions_cache, new_rows], ignore_index=True)
+            if 'target_hashtags' in combined.columns:
+                # Merge the category sets so the column stays categorical
+                combined['target_hashtags'] = union_categoricals(
+                    [self._sessions_cache['target_hashtags'], new_rows['target_hashtags']]
+                )
+            self._set_sessions_cache(combined)
+        
+        if cold_start and not new_rows.empty:
+            self._save_snapshot()
+        return self._sessions_cache
+    
+    def _is_appended_to(self, f, stat: os.stat_result) -> bool:
+        """Tell whether the open sessions file is the parsed one with rows added after the offset."""
+        return (stat.st_ino == self._sessions_ino and stat.st_size > self._sessions_offset
+                and self._file_fingerprint(f, self._sessions_offset) == self._sessions_fingerprint)
+    
+    @staticmethod
+    def _file_fingerprint(f, offset: int) -> str:
+        """Hash the header line and the last line before offset, which an append leaves untouched."""
+        f.seek(0)
+        header = f.readline()
+        start = max(0, offset - 4096)
+        f.seek(start)
+        covered = f.read(offset - start)
+        last_line = covered[covered.rstrip(b'\r\n').rfind(b'\n') + 1:]
+        return hashlib.blake2b(header + b'\0' + last_line, digest_size=16).hexdigest()
+    
+    def _set_sessions_cache(self, sessions_df: 'pd.DataFrame'):
+        """Store the sessions history sorted by timestamp, with int64 nanosecond keys for range lookups."""
+        timestamps = sessions_df['timestamp']
+        if not timestamps.is_monotonic_increasing:
+            sessions_df = sessions_df.sort_values('timestamp', kind='stable', ignore_index=True)
+        
+        self._sessions_cache = sessions_df
+        self._ts_ns = sessions_df['timestamp'].to_numpy().astype('datetime64[ns]').view(np.int64)
+    
+    def _slice_sessions(self, sessions_df: 'pd.DataFrame', start: datetime, end: datetime,
+                        include_end: bool = False) -> 'pd.DataFrame':
+        """Return the cached sessions between start and end using binary search on the sorted timestamps."""
+        bounds = np.array([start, end], dtype='datetime64[ns]').view(np.int64)
+        lo = np.searchsorted(self._ts_ns, bounds[0], side='left')
+        hi = np.searchsorted(self._ts_ns, bounds[1], side='right' if include_end else 'left')
+        return sessions_df.iloc[lo:hi]
+    
+    def _restore_snapshot(self, stat: os.stat_result):
+        """Seed the sessions cache from the Parquet snapshot if it still matches the CSV."""
+        try:
+            meta = self.data_manager.load_from_json(self._snapshot_meta_path)
+        except ValueError:
+            return
+        if not meta or meta.get('ino') != stat.st_ino or meta['offset'] > stat.st_size:
+            return
+        # An untouched file keeps its mtime; a grown one must still hold the snapshot's header and last line
+        if meta['offset'] == stat.st_size and meta.get('mtime') != stat.st_mtime:
+            return
+        with open(self._sessions_path, 'rb') as f:
+            if self._file_fingerprint(f, meta['offset']) != meta.get('fingerprint'):
+                return
+        
+        try:
+            self._set_sessions_cache(self.data_manager.load_from_parquet(self._snapshot_path))
+        except Exception as e:
+            self.logger.warning("Ignoring sessions snapshot: %s", e)
+            return
+        
+        self._sessions_columns = meta['columns']
+        self._sessions_offset = meta['offset']
+        self._sessions_mtime = meta['mtime']
+        self._sessions_ino = meta['ino']
+        self._sessions_fingerprint = meta['fingerprint']
+    
+    def _save_snapshot(self):
+        """Persist the parsed sessions history as a Parquet snapshot."""
+        try:
+            self.data_manager.save_to_parquet(self._sessions_cache, self._snapshot_path)
+        except Exception as e:
+            self.logger.warning("Could not save sessions snapshot: %s", e)
+            return
+        
+        meta = {
+            'offset': self._sessions_offset,
+            'columns': self._sessions_columns,
+            'ino': self._sessions_ino,
+            'mtime': self._sessions_mtime,
+            'fingerprint': self._sessions_fingerprint
+        }
+        self.data_manager.save_to_json(meta, self._snapshot_meta_path)
     
     def generate_daily_report(self, date: str = None) -> Dict[str, Any]:
         """Generate daily performance report."""
@@ -45,24 +270,26 @@ class AnalyticsManager:
         
         try:
             # Load session data
-            sessions_df = pd.read_csv(f"{self.analytics_dir}/sessions.csv")
-            sessions_df['date'] = pd.to_datetime(sessions_df['timestamp']).dt.date
+            sessions_df = self._load_sessions()
             
-            # Filter for specific date
-            daily_sessions = sessions_df[sessions_df['date'] == pd.to_datetime(date).date()]
+            # Slice the specific date out of the time-sorted history
+            day_start = datetime.fromisoformat(date).replace(hour=0, minute=0, second=0, microsecond=0)
+            daily_sessions = self._slice_sessions(sessions_df, day_start, day_start + timedelta(days=1))
             
             if daily_sessions.empty:
                 return {"error": f"No data found for {date}"}
             
             # Calculate metrics
+            likes, follows, comments = daily_sessions[COUNT_COLUMNS].to_numpy().sum(axis=0)
+            duration, success_rate = daily_sessions[['duration_minutes', 'success_rate']].to_numpy().mean(axis=0, dtype=np.float64)
             report = {
                 'date': date,
                 'total_sessions': len(daily_sessions),
-                'total_likes': daily_sessions['likes_count'].sum(),
-                'total_follows': daily_sessions['follows_count'].sum(),
-                'total_comments': daily_sessions['comments_count'].sum(),
-                'avg_session_duration': daily_sessions['duration_minutes'].mean(),
-                'success_rate': daily_sessions['success_rate'].mean(),
+                'total_likes': likes,
+                'total_follows': follows,
+                'total_comments': comments,
+                'avg_session_duration': duration,
+                'success_rate': success_rate,
                 'most_active_hashtag': self._get_most_active_hashtag(daily_sessions)
             }
             
@@ -75,7 +302,7 @@ class AnalyticsManager:
         except FileNotFoundError:
             return {"error": "No analytics data available"}
         except Exception as e:
-            self.logger.error(f"Error generating daily report: {str(e)}")
+            self.logger.error("Error generating daily report: %s", e)
             return {"error": str(e)}
     
     def generate_weekly_report(self) -> Dict[str, Any]:
@@ -84,26 +311,23 @@ class AnalyticsManager:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=7)
             
-            sessions_df = pd.read_csv(f"{self.analytics_dir}/sessions.csv")
-            sessions_df['timestamp'] = pd.to_datetime(sessions_df['timestamp'])
+            sessions_df = self._load_sessions()
             
-            # Filter for last 7 days
-            weekly_sessions = sessions_df[
-                (sessions_df['timestamp'] >= start_date) & 
-                (sessions_df['timestamp'] <= end_date)
-            ]
+            # Slice the last 7 days out of the time-sorted history
+            weekly_sessions = self._slice_sessions(sessions_df, start_date, end_date, include_end=True)
             
             if weekly_sessions.empty:
                 return {"error": "No data found for the past week"}
             
+            likes, follows, comments = weekly_sessions[COUNT_COLUMNS].to_numpy().sum(axis=0)
             report = {
                 'period': f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
                 'total_sessions': len(weekly_sessions),
-                'total_likes': weekly_sessions['likes_count'].sum(),
-                'total_follows': weekly_sessions['follows_count'].sum(),
-                'total_comments': weekly_sessions['comments_count'].sum(),
-                'avg_daily_likes': weekly_sessions['likes_count'].sum() / 7,
-                'avg_daily_follows': weekly_sessions['follows_count'].sum() / 7,
+                'total_likes': likes,
+                'total_follows': follows,
+                'total_comments': comments,
+                'avg_daily_likes': likes / 7,
+                'avg_daily_follows': follows / 7,
                 'best_performing_day': self._get_best_performing_day(weekly_sessions),
                 'engagement_trend': self._calculate_engagement_trend(weekly_sessions)
             }
@@ -111,122 +335,171 @@ class AnalyticsManager:
             return report
             
         except Exception as e:
-            self.logger.error(f"Error generating weekly report: {str(e)}")
+            self.logger.error("Error generating weekly report: %s", e)
             return {"error": str(e)}
     
-    def create_performance_charts(self):
+    def create_performance_charts(self, high_dpi: bool = False):
         """Create visualization charts for performance metrics."""
         try:
-            sessions_df = pd.read_csv(f"{self.analytics_dir}/sessions.csv")
-            sessions_df['timestamp'] = pd.to_datetime(sessions_df['timestamp'])
-            sessions_df['date'] = sessions_df['timestamp'].dt.date
+            chart_path = f"{self.analytics_dir}/performance_charts.png"
+            dpi = 300 if high_dpi else 150
             
-            # Set up the plotting style
-            plt.style.use('seaborn-v0_8')
-            fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-            fig.suptitle('Instagram Bot Performance Analytics', fontsize=16, fontweight='bold')
+            # Reuse the last chart if it was drawn from the same parsed history
+            sessions_df = self._load_sessions()
+            cache_key = (self._sessions_ino, self._sessions_mtime, self._sessions_offset, dpi)
+            if self._chart_cache == (cache_key, chart_path) and os.path.exists(chart_path):
+                return chart_path
             
-            # Daily activity chart
-            daily_activity = sessions_df.groupby('date').agg({
-                'likes_count': 'sum',
-                'follows_count': 'sum',
-                'comments_count': 'sum'
-            }).reset_index()
-            
-            axes[0, 0].plot(daily_activity['date'], daily_activity['likes_count'], marker='o', label='Likes')
-            axes[0, 0].plot(daily_activity['date'], daily_activity['follows_count'], marker='s', label='Follows')
-            axes[0, 0].plot(daily_activity['date'], daily_activity['comments_count'], marker='^', label='Comments')
-            axes[0, 0].set_title('Daily Activity Trends')
-            axes[0, 0].set_xlabel('Date')
-            axes[0, 0].set_ylabel('Count')
-            axes[0, 0].legend()
-            axes[0, 0].tick_params(axis='x', rotation=45)
-            
-            # Success rate distribution
-            axes[0, 1].hist(sessions_df['success_rate'], bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-            axes[0, 1].set_title('Success Rate Distribution')
-            axes[0, 1].set_xlabel('Success Rate (%)')
-            axes[0, 1].set_ylabel('Frequency')
-            
-            # Session duration analysis
-            axes[1, 0].boxplot(sessions_df['duration_minutes'])
-            axes[1, 0].set_title('Session Duration Analysis')
-            axes[1, 0].set_ylabel('Duration (minutes)')
-            
-            # Hashtag performance (if available)
-            if 'target_hashtags' in sessions_df.columns:
-                hashtag_performance = sessions_df.groupby('target_hashtags')['likes_count'].sum().head(10)
-                axes[1, 1].bar(range(len(hashtag_performance)), hashtag_performance.values)
-                axes[1, 1].set_title('Top Performing Hashtags')
-                axes[1, 1].set_xlabel('Hashtags')
-                axes[1, 1].set_ylabel('Total Likes')
-                axes[1, 1].set_xticks(range(len(hashtag_performance)))
-                axes[1, 1].set_xticklabels(hashtag_performance.index, rotation=45)
-            
-            plt.tight_layout()
-            chart_path = f"{self.analytics_dir}/performance_charts.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            import pandas as pd
+            from matplotlib import style
+            
+            # Draw with the Agg canvas under a scoped style, reusing one figure across calls
+            with style.context('seaborn-v0_8'):
+                fig, axes = self._get_chart_figure()
+                
+                # Aggregate everything from the raw column arrays in one pass
+                counts = sessions_df[COUNT_COLUMNS].to_numpy()
+                dates = sessions_df['timestamp'].to_numpy().astype('datetime64[D]')
+                days, day_idx = np.unique(dates, return_inverse=True)
+                daily_likes, daily_follows, daily_comments = (
+                    np.bincount(day_idx, weights=counts[:, i], minlength=len(days)) for i in range(3)
+                )
+                
+                # Daily activity chart
+                axes[0, 0].plot(days, daily_likes, marker='o', label='Likes')
+                axes[0, 0].plot(days, daily_follows, marker='s', label='Follows')
+                axes[0, 0].plot(days, daily_comments, marker='^', label='Comments')
+                axes[0, 0].set_title('Daily Activity Trends')
+                axes[0, 0].set_xlabel('Date')
+                axes[0, 0].set_ylabel('Count')
+                axes[0, 0].legend()
+                axes[0, 0].tick_params(axis='x', rotation=45)
+                
+                # Success rate distribution
+                axes[0, 1].hist(sessions_df['success_rate'].to_numpy(), bins=20, alpha=0.7, color='skyblue', edgecolor='black')
+                axes[0, 1].set_title('Success Rate Distribution')
+                axes[0, 1].set_xlabel('Success Rate (%)')
+                axes[0, 1].set_ylabel('Frequency')
+                
+                # Session duration analysis
+                axes[1, 0].boxplot(sessions_df['duration_minutes'].to_numpy())
+                axes[1, 0].set_title('Session Duration Analysis')
+                axes[1, 0].set_ylabel('Duration (minutes)')
+                
+                # Hashtag performance (if available)
+                if 'target_hashtags' in sessions_df.columns:
+                    hashtags = pd.Categorical(sessions_df['target_hashtags'])
+                    valid = hashtags.codes >= 0
+                    hashtag_likes = np.bincount(hashtags.codes[valid], weights=counts[valid, 0],
+                                                minlength=len(hashtags.categories))
+                    
+                    # Top 10 by likes without sorting every hashtag
+                    top_n = min(10, len(hashtag_likes))
+                    top = np.argpartition(-hashtag_likes, top_n - 1)[:top_n] if top_n else np.arange(0)
+                    top = top[np.argsort(-hashtag_likes[top], kind='stable')]
+                    
+                    axes[1, 1].bar(range(len(top)), hashtag_likes[top])
+                    axes[1, 1].set_title('Top Performing Hashtags')
+                    axes[1, 1].set_xlabel('Hashtags')
+                    axes[1, 1].set_ylabel('Total Likes')
+                    axes[1, 1].set_xticks(range(len(top)))
+                    axes[1, 1].set_xticklabels(hashtags.categories[top], rotation=45)
+                
+                fig.tight_layout()
+                fig.savefig(chart_path, dpi=dpi, bbox_inches='tight')
+            self._chart_cache = (cache_key, chart_path)
             
-            self.logger.info(f"Performance charts saved to {chart_path}")
+            self.logger.info("Performance charts saved to %s", chart_path)
             return chart_path
             
         except Exception as e:
-            self.logger.error(f"Error creating performance charts: {str(e)}")
+            self.logger.error("Error creating performance charts: %s", e)
             return None
     
+    def _get_chart_figure(self):
+        """Return the persistent chart figure and its axes, cleared for redrawing."""
+        if self._chart_figure is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            
+            fig = Figure(figsize=(15, 12))
+            FigureCanvasAgg(fig)
+            fig.suptitle('Instagram Bot Performance Analytics', fontsize=16, fontweight='bold')
+            self._chart_figure = (fig, fig.subplots(2, 2))
+        else:
+            for ax in self._chart_figure[1].flat:
+                ax.clear()
+        return self._chart_figure
+    
     def get_engagement_metrics(self) -> Dict[str, float]:
         """Calculate key engagement metrics."""
         try:
-            sessions_df = pd.read_csv(f"{self.analytics_dir}/sessions.csv")
+            sessions_df = self._load_sessions()
             
             if sessions_df.empty:
                 return {}
             
+            totals = sessions_df[COUNT_COLUMNS].to_numpy().sum(axis=0)
+            duration, success_rate = sessions_df[['duration_minutes', 'success_rate']].to_numpy().mean(axis=0, dtype=np.float64)
+            avg_likes, avg_follows, avg_comments = totals / len(sessions_df)
+            
             metrics = {
-                'avg_likes_per_session': sessions_df['likes_count'].mean(),
-                'avg_follows_per_session': sessions_df['follows_count'].mean(),
-                'avg_comments_per_session': sessions_df['comments_count'].mean(),
-                'overall_success_rate': sessions_df['success_rate'].mean(),
-                'total_engagement_actions': (
-                    sessions_df['likes_count'].sum() + 
-                    sessions_df['follows_count'].sum() + 
-                    sessions_df['comments_count'].sum()
-                ),
-                'avg_session_duration': sessions_df['duration_minutes'].mean()
+                'avg_likes_per_session': avg_likes,
+                'avg_follows_per_session': avg_follows,
+                'avg_comments_per_session': avg_comments,
+                'overall_success_rate': success_rate,
+                'total_engagement_actions': totals.sum(),
+                'avg_session_duration': duration
             }
             
             return metrics
             
         except Exception as e:
-            self.logger.error(f"Error calculating engagement metrics: {str(e)}")
+            self.logger.error("Error calculating engagement metrics: %s", e)
             return {}
     
-    def _get_most_active_hashtag(self, sessions_df: pd.DataFrame) -> str:
+    def _get_most_active_hashtag(self, sessions_df: 'pd.DataFrame') -> str:
         """Get the most frequently used hashtag."""
         try:
-            if 'target_hashtags' in sessions_df.columns:
-                hashtag_counts = sessions_df['target_hashtags'].value_counts()
-                return hashtag_counts.index[0] if not hashtag_counts.empty else "N/A"
-            return "N/A"
+            if 'target_hashtags' not in sessions_df.columns:
+                return "N/A"
+            
+            hashtags = sessions_df['target_hashtags']
+            if hashtags.dtype == 'category':
+                # Integer histogram over the category codes
+                codes = hashtags.cat.codes.to_numpy()
+                hashtag_counts = np.bincount(codes[codes >= 0], minlength=len(hashtags.cat.categories))
+                return hashtags.cat.categories[hashtag_counts.argmax()] if hashtag_counts.any() else "N/A"
+            
+            values, hashtag_counts = np.unique(hashtags.dropna().to_numpy(), return_counts=True)
+            return values[hashtag_counts.argmax()] if len(values) else "N/A"
         except:
             return "N/A"
     
-    def _get_best_performing_day(self, sessions_df: pd.DataFrame) -> str:
+    def _get_best_performing_day(self, sessions_df: 'pd.DataFrame') -> str:
         """Get the day with highest engagement."""
         try:
-            sessions_df['day'] = sessions_df['timestamp'].dt.day_name()
-            daily_engagement = sessions_df.groupby('day')['likes_count'].sum()
-            return daily_engagement.idxmax()
+            if sessions_df.empty:
+                return "N/A"
+            weekday = sessions_df['weekday'].to_numpy()
+            likes = sessions_df['likes_count'].to_numpy()
+            
+            daily_engagement = np.bincount(weekday, weights=likes, minlength=7)
+            daily_engagement[np.bincount(weekday, minlength=7) == 0] = -np.inf
+            return DAY_NAMES[daily_engagement.argmax()]
         except:
             return "N/A"
     
-    def _calculate_engagement_trend(self, sessions_df: pd.DataFrame) -> str:
+    def _calculate_engagement_trend(self, sessions_df: 'pd.DataFrame') -> str:
         """Calculate if engagement is trending up or down."""
         try:
-            sessions_df = sessions_df.sort_values('timestamp')
-            first_half = sessions_df.iloc[:len(sessions_df)//2]['likes_count'].mean()
-            second_half = sessions_df.iloc[len(sessions_df)//2:]['likes_count'].mean()
+            if len(sessions_df) < 2:
+                return "Stable"
+            order = np.argsort(sessions_df['timestamp'].to_numpy().view('i8'), kind='stable')
+            likes = sessions_df['likes_count'].to_numpy()[order]
+            mid = len(likes) // 2
+            first_half = likes[:mid].mean()
+            second_half = likes[mid:].mean()
             
             if second_half > first_half:
                 return "Increasing"
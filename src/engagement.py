@@ -1,197 +1,232 @@
 import random
 import time
-from typing import List, Dict, Any
+import numpy as np
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from utils import Logger, RateLimiter
+from utils import Config, Logger, RateLimiter
 
 class EngagementStrategy:
     """Handles Instagram engagement strategies."""
     
-    def __init__(self, driver, config: Dict[str, Any], logger: Logger, rate_limiter: RateLimiter):
+    # Alternative selectors are joined into one CSS union so a single
+    # find_elements call covers every variant
+    _LIKE_SELECTOR = 'svg[aria-label="Like"], button[aria-label="Like"], [data-testid="like-button"]'
+    
+    # The author's Follow button lives in the post header; scoping to it skips suggested accounts,
+    # and matching the text in the page avoids one round-trip per candidate button
+    _FOLLOW_SCRIPT = (
+        "return [...document.querySelectorAll('header [data-testid=\"follow-button\"], header button')]"
+        ".find(b => b.innerText.trim() === 'Follow') || null;"
+    )
+    
+    # Number of post links harvested per hashtag page load
+    POST_URL_BATCH = 20
+    
+    def __init__(self, driver, config: Config, logger: Logger, rate_limiter: RateLimiter,
+                 rng: Optional[np.random.Generator] = None):
         self.driver = driver
         self.config = config
         self.logger = logger
         self.rate_limiter = rate_limiter
+        
+        # Rely on explicit waits only; missing elements return immediately
+        self.driver.implicitly_wait(0)
         self.wait = WebDriverWait(driver, 10)
+        self._rng = rng if rng is not None else np.random.default_rng()
+        
+        # Post URLs harvested per hashtag page, shared by the like/follow/comment passes
+        self._post_urls: Dict[str, Tuple[int, List[str]]] = {}
+        
+        # Per-hashtag action totals, logged as one summary line per pass
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'likes': 0, 'follows': 0, 'comments': 0})
+    
+    @staticmethod
+    def _hashtag_url(hashtag: str) -> str:
+        """Build the explore URL for a hashtag."""
+        return f"https://www.instagram.com/explore/tags/{hashtag.replace('#', '')}/"
+    
+    def _get_post_urls(self, hashtag: str, limit: int) -> List[str]:
+        """Return up to `limit` post URLs for a hashtag, loading its page only when needed."""
+        hashtag_url = self._hashtag_url(hashtag)
+        requested, post_urls = self._post_urls.get(hashtag_url, (0, []))
+        if requested >= limit:
+            return post_urls[:limit]
+        
+        # Harvest enough links for every action type in one page load
+        requested = max(limit, self.POST_URL_BATCH)
+        self.driver.get(hashtag_url)
+        time.sleep(3)
+        
+        self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "article a")))
+        
+        # Read every link in one script call instead of one round-trip per element
+        post_urls = self.driver.execute_script(
+            "return Array.from(document.querySelectorAll('article a'))"
+            ".slice(0, arguments[0]).map(a => a.href);",
+            requested
+        )
+        self._post_urls[hashtag_url] = (requested, post_urls)
+        return post_urls[:limit]
     
     def like_posts_by_hashtag(self, hashtag: str, max_likes: int = 20) -> int:
         """Like posts from a specific hashtag."""
         likes_count = 0
+        started = time.monotonic()
         
         try:
-            # Navigate to hashtag page
-            hashtag_url = f"https://www.instagram.com/explore/tags/{hashtag.replace('#', '')}/"
-            self.driver.get(hashtag_url)
-            time.sleep(3)
-            
-            # Find and click on posts
-            posts = self.wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "article a"))
-            )
+            # Collect post links from the hashtag page
+            post_urls = self._get_post_urls(hashtag, max_likes)
             
-            for i, post in enumerate(posts[:max_likes]):
-                if not self.rate_limiter.can_perform_action('likes'):
-                    self.logger.warning("Daily like limit reached")
-                    break
-                
-                try:
-                    post.click()
-                    time.sleep(2)
-                    
-                    # Like the post
-                    if self._like_current_post():
-                        likes_count += 1
-                        self.rate_limiter.record_action('likes')
-                        self.logger.info(f"Liked post {i+1} from #{hashtag}")
-                    
-                    # Close post modal
-                    self._close_post_modal()
-                    self.rate_limiter.wait_random_delay()
+            for i, post_url in enumerate(post_urls):
+                # Only posts that were not already liked use up the like budget
+                with self.rate_limiter.action_slot('likes') as slot:
+                    if not slot.granted:
+                        self.logger.warning("Daily like limit reached")
+                        break
                     
-                except Exception as e:
-                    self.logger.error(f"Error liking post: {str(e)}")
-                    continue
+                    try:
+                        self.driver.get(post_url)
+                        time.sleep(2)
+                        
+                        # Like the post
+                        if self._like_current_post():
+                            slot.commit()
+                            likes_count += 1
+                            self.logger.debug("Liked post %d from #%s", i+1, hashtag)
+                        
+                    except Exception as e:
+                        self.logger.error("Error liking post: %s", e)
+                        continue
+                
+                self.rate_limiter.wait_random_delay()
         
         except Exception as e:
-            self.logger.error(f"Error in like_posts_by_hashtag: {str(e)}")
+            self.logger.error("Error in like_posts_by_hashtag: %s", e)
         
+        self._record_pass(hashtag, 'likes', likes_count, started)
         return likes_count
     
     def follow_users_by_hashtag(self, hashtag: str, max_follows: int = 10) -> int:
         """Follow users who posted with a specific hashtag."""
         follows_count = 0
+        started = time.monotonic()
         
         try:
-            hashtag_url = f"https://www.instagram.com/explore/tags/{hashtag.replace('#', '')}/"
-            self.driver.get(hashtag_url)
-            time.sleep(3)
-            
-            posts = self.wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "article a"))
-            )
+            post_urls = self._get_post_urls(hashtag, max_follows)
             
-            for i, post in enumerate(posts[:max_follows]):
-                if not self.rate_limiter.can_perform_action('follows'):
-                    self.logger.warning("Daily follow limit reached")
-                    break
-                
-                try:
-                    post.click()
-                    time.sleep(2)
-                    
-                    # Follow the user
-                    if self._follow_current_user():
-                        follows_count += 1
-                        self.rate_limiter.record_action('follows')
-                        self.logger.info(f"Followed user from post {i+1} in #{hashtag}")
+            for i, post_url in enumerate(post_urls):
+                # Authors that are already followed do not use up the follow budget
+                with self.rate_limiter.action_slot('follows') as slot:
+                    if not slot.granted:
+                        self.logger.warning("Daily follow limit reached")
+                        break
                     
-                    self._close_post_modal()
-                    self.rate_limiter.wait_random_delay()
-                    
-                except Exception as e:
-                    self.logger.error(f"Error following user: {str(e)}")
-                    continue
+                    try:
+                        self.driver.get(post_url)
+                        time.sleep(2)
+                        
+                        # Follow the user
+                        if self._follow_current_user():
+                            slot.commit()
+                            follows_count += 1
+                            self.logger.debug("Followed user from post %d in #%s", i+1, hashtag)
+                        
+                    except Exception as e:
+                        self.logger.error("Error following user: %s", e)
+                        continue
+                
+                self.rate_limiter.wait_random_delay()
         
         except Exception as e:
-            self.logger.error(f"Error in follow_users_by_hashtag: {str(e)}")
+            self.logger.error("Error in follow_users_by_hashtag: %s", e)
         
+        self._record_pass(hashtag, 'follows', follows_count, started)
         return follows_count
     
     def comment_on_posts(self, hashtag: str, max_comments: int = 5) -> int:
         """Comment on posts from a specific hashtag."""
         comments_count = 0
+        started = time.monotonic()
         
-        if not self.config['comments']['enabled']:
+        if not self.config.comments.enabled:
             return 0
         
         try:
-            hashtag_url = f"https://www.instagram.com/explore/tags/{hashtag.replace('#', '')}/"
-            self.driver.get(hashtag_url)
-            time.sleep(3)
+            post_urls = self._get_post_urls(hashtag, max_comments)
             
-            posts = self.wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "article a"))
-            )
+            # Decide up front which posts get a comment, in one RNG call
+            comment_mask = self._rng.random(len(post_urls)) < self.config.engagement.comment_probability
             
-            for i, post in enumerate(posts[:max_comments]):
-                if not self.rate_limiter.can_perform_action('comments'):
-                    self.logger.warning("Daily comment limit reached")
-                    break
-                
-                if random.random() > self.config['engagement']['comment_probability']:
+            for i, (post_url, should_comment) in enumerate(zip(post_urls, comment_mask)):
+                if not should_comment:
                     continue
                 
-                try:
-                    post.click()
-                    time.sleep(2)
-                    
-                    # Comment on the post
-                    if self._comment_on_current_post():
-                        comments_count += 1
-                        self.rate_limiter.record_action('comments')
-                        self.logger.info(f"Commented on post {i+1} from #{hashtag}")
-                    
-                    self._close_post_modal()
-                    self.rate_limiter.wait_random_delay()
+                with self.rate_limiter.action_slot('comments') as slot:
+                    if not slot.granted:
+                        self.logger.warning("Daily comment limit reached")
+                        break
                     
-                except Exception as e:
-                    self.logger.error(f"Error commenting on post: {str(e)}")
-                    continue
+                    try:
+                        self.driver.get(post_url)
+                        time.sleep(2)
+                        
+                        # Comment on the post
+                        if self._comment_on_current_post():
+                            slot.commit()
+                            comments_count += 1
+                            self.logger.debug("Commented on post %d from #%s", i+1, hashtag)
+                        
+                    except Exception as e:
+                        self.logger.error("Error commenting on post: %s", e)
+                        continue
+                
+                self.rate_limiter.wait_random_delay()
         
         except Exception as e:
-            self.logger.error(f"Error in comment_on_posts: {str(e)}")
+            self.logger.error("Error in comment_on_posts: %s", e)
         
+        self._record_pass(hashtag, 'comments', comments_count, started)
         return comments_count
     
+    def _record_pass(self, hashtag: str, action: str, count: int, started: float):
+        """Add an engagement pass to the hashtag totals and log one summary line."""
+        tag = hashtag.replace('#', '')
+        stats = self._stats[tag]
+        stats[action] += count
+        self.logger.info("hashtag=%s likes=%d follows=%d comments=%d (%s pass took %.0fs)",
+                         tag, stats['likes'], stats['follows'], stats['comments'],
+                         action, time.monotonic() - started)
+    
     def _like_current_post(self) -> bool:
         """Like the currently opened post."""
         try:
             # Look for like button (heart icon)
-            like_selectors = [
-                'svg[aria-label="Like"]',
-                'button[aria-label="Like"]',
-                '[data-testid="like-button"]'
-            ]
+            like_buttons = self.driver.find_elements(By.CSS_SELECTOR, self._LIKE_SELECTOR)
+            if not like_buttons:
+                return False
             
-            for selector in like_selectors:
-                try:
-                    like_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    like_button.click()
-                    time.sleep(1)
-                    return True
-                except NoSuchElementException:
-                    continue
-            
-            return False
+            like_buttons[0].click()
+            time.sleep(1)
+            return True
         except Exception as e:
-            self.logger.error(f"Error liking post: {str(e)}")
+            self.logger.error("Error liking post: %s", e)
             return False
     
     def _follow_current_user(self) -> bool:
         """Follow the user of the currently opened post."""
         try:
-            follow_selectors = [
-                'button:contains("Follow")',
-                '[data-testid="follow-button"]',
-                'button[type="button"]:contains("Follow")'
-            ]
+            follow_button = self.driver.execute_script(self._FOLLOW_SCRIPT)
+            if not follow_button:
+                return False
             
-            for selector in follow_selectors:
-                try:
-                    follow_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if follow_button.text.lower() == "follow":
-                        follow_button.click()
-                        time.sleep(1)
-                        return True
-                except NoSuchElementException:
-                    continue
-            
-            return False
+            follow_button.click()
+            time.sleep(1)
+            return True
         except Exception as e:
-            self.logger.error(f"Error following user: {str(e)}")
+            self.logger.error("Error following user: %s", e)
             return False
     
     def _comment_on_current_post(self) -> bool:
@@ -204,7 +239,7 @@ class EngagementStrategy:
             )
             
             # Select random comment
-            comment = random.choice(self.config['comments']['templates'])
+            comment = random.choice(self.config.comments.templates)
             
             comment_input.click()
             comment_input.send_keys(comment)
@@ -220,31 +255,5 @@ class EngagementStrategy:
             
             return True
         except Exception as e:
-            self.logger.error(f"Error commenting: {str(e)}")
-            return False
-    
-    def _close_post_modal(self):
-        """Close the post modal/overlay."""
-        try:
-            # Try different methods to close modal
-            close_selectors = [
-                'svg[aria-label="Close"]',
-                'button[aria-label="Close"]',
-                '[data-testid="modal-close-button"]'
-            ]
-            
-            for selector in close_selectors:
-                try:
-                    close_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    close_button.click()
-                    time.sleep(1)
-                    return
-                except NoSuchElementException:
-                    continue
-            
-            # If no close button found, press ESC key
-            from selenium.webdriver.common.keys import Keys
-            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-            
-        except Exception as e:
-            self.logger.error(f"Error closing modal: {str(e)}")
\ No newline at end of file
+            self.logger.error("Error commenting: %s", e)
+            return False
\ No newline at end of file
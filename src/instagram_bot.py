@@ -1,22 +1,33 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import os
 import time
-import random
+import queue
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Any, Optional, Tuple
 
-from utils import ConfigManager, Logger, RateLimiter, get_random_user_agent
-from engagement import EngagementStrategy
+from utils import ConfigManager, Logger, RateLimiter, get_random_user_agent, retry_with_backoff
 from analytics import AnalyticsManager
 
+# Selenium and the engagement strategy are imported where a browser is needed,
+# so analytics-only use of the bot does not pay for the Selenium import
+if TYPE_CHECKING:
+    from engagement import EngagementStrategy
+
 class InstagramBot:
     """Main Instagram Bot class for automated engagement."""
     
+    DRIVER_PATH_FILE = "config/.chromedriver_path"
+    DRIVER_PATH_MAX_AGE = 24 * 60 * 60  # Re-check for driver updates once a day
+    _driver_path_cache: ClassVar[Optional[str]] = None
+    
+    # Ways to locate a dialog's "Not Now" button, cheapest first
+    _NOT_NOW_CLASS_SELECTOR = 'div[role="dialog"] button._a9--._ap36'
+    _NOT_NOW_TEXT_SCRIPT = (
+        "return [...document.querySelectorAll('div[role=dialog] button')]"
+        ".find(b => b.innerText.trim() === 'Not Now') || null;"
+    )
+    
     def __init__(self, config_path: str = "config/config.json"):
         """Initialize the Instagram bot."""
         self.config = ConfigManager.load_config(config_path)
@@ -24,6 +35,10 @@ class InstagramBot:
         self.rate_limiter = RateLimiter(self.config)
         self.analytics = AnalyticsManager(self.logger)
         self.driver = None
+        self._logged_in = False
+        self._not_now_selector = None
+        # Seeded from engagement.random_seed; each strategy gets its own child stream via spawn()
+        self._rng = np.random.default_rng(self.config.engagement.random_seed)
         self.engagement = None
         self.session_start_time = None
         
@@ -32,85 +47,153 @@ class InstagramBot:
     def setup_driver(self):
         """Set up Chrome WebDriver with appropriate options."""
         try:
-            chrome_options = Options()
-            
-            # Configure Chrome options
-            if self.config['safety']['headless_mode']:
-                chrome_options.add_argument('--headless')
-            
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Set user agent
-            if self.config['safety']['user_agent_rotation']:
-                user_agent = get_random_user_agent()
-                chrome_options.add_argument(f'--user-agent={user_agent}')
-            
-            # Set up driver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Execute script to remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
+            self.driver = self._create_driver()
             self.logger.info("WebDriver setup completed")
             
         except Exception as e:
-            self.logger.error(f"Error setting up WebDriver: {str(e)}")
+            self.logger.error("Error setting up WebDriver: %s", e)
             raise
     
+    def _create_driver(self):
+        """Create a new Chrome WebDriver with the configured options."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        
+        chrome_options = Options()
+        
+        # Configure Chrome options
+        if self.config.safety.headless_mode:
+            chrome_options.add_argument('--headless')
+            
+            # Nobody watches a headless run: return once the DOM is ready and skip image downloads
+            chrome_options.set_capability("pageLoadStrategy", "eager")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2
+            })
+        
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # Set user agent
+        if self.config.safety.user_agent_rotation:
+            user_agent = get_random_user_agent()
+            chrome_options.add_argument(f'--user-agent={user_agent}')
+        
+        # Set up driver
+        service = Service(self._resolve_driver_path())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        # Execute script to remove webdriver property
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        return driver
+    
+    @classmethod
+    def _resolve_driver_path(cls) -> str:
+        """Return the chromedriver path, resolving it through ChromeDriverManager at most once a day."""
+        if cls._driver_path_cache and os.path.isfile(cls._driver_path_cache):
+            return cls._driver_path_cache
+        
+        # Reuse the path resolved by an earlier process while it is fresh
+        try:
+            if time.time() - os.path.getmtime(cls.DRIVER_PATH_FILE) < cls.DRIVER_PATH_MAX_AGE:
+                with open(cls.DRIVER_PATH_FILE, 'r') as f:
+                    path = f.read().strip()
+                if os.path.isfile(path):
+                    cls._driver_path_cache = path
+                    return path
+        except OSError:
+            pass
+        
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        cls._driver_path_cache = path
+        try:
+            os.makedirs(os.path.dirname(cls.DRIVER_PATH_FILE), exist_ok=True)
+            with open(cls.DRIVER_PATH_FILE, 'w') as f:
+                f.write(path)
+        except OSError:
+            pass  # The in-process cache still applies
+        return path
+    
+    def _create_worker_driver(self):
+        """Create an extra WebDriver that shares the logged-in session of the main driver."""
+        driver = self._create_driver()
+        driver.get("https://www.instagram.com/")
+        for cookie in self.driver.get_cookies():
+            driver.add_cookie(cookie)
+        return driver
+    
     def login(self) -> bool:
         """Login to Instagram."""
+        if self._logged_in and self.driver:
+            self.logger.info("Reusing logged-in Instagram session")
+            return True
+        
         try:
-            if not self.driver:
-                self.setup_driver()
-            
-            self.logger.info("Attempting to login to Instagram")
-            
-            # Navigate to Instagram login page
-            self.driver.get("https://www.instagram.com/accounts/login/")
-            time.sleep(3)
-            
-            # Wait for login form to load
-            wait = WebDriverWait(self.driver, 10)
-            
-            # Find and fill username
-            username_input = wait.until(
-                EC.presence_of_element_located((By.NAME, "username"))
-            )
-            username_input.send_keys(self.config['credentials']['username'])
-            
-            # Find and fill password
-            password_input = self.driver.find_element(By.NAME, "password")
-            password_input.send_keys(self.config['credentials']['password'])
+            return self._attempt_login()
+        except Exception as e:
+            self.logger.error("Error during login: %s", e)
+            return False
+    
+    @retry_with_backoff(max_attempts=3, base=1.0)
+    def _attempt_login(self) -> bool:
+        """Run one login attempt; errors propagate so transient failures are retried."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
+        if not self.driver:
+            self.setup_driver()
+        
+        self.logger.info("Attempting to login to Instagram")
+        
+        # Navigate to Instagram login page
+        self.driver.get("https://www.instagram.com/accounts/login/")
+        
+        # Wait for login form to load
+        wait = WebDriverWait(self.driver, 15)
+        
+        # Find and fill username
+        username_input = wait.until(
+            EC.presence_of_element_located((By.NAME, "username"))
+        )
+        username_input.send_keys(self.config.credentials.username)
+        
+        # Find and fill password
+        password_input = self.driver.find_element(By.NAME, "password")
+        password_input.send_keys(self.config.credentials.password)
+        
+        # Click login button
+        login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
+        login_button.click()
+        
+        # Wait for login to complete
+        try:
+            wait.until(lambda d: "login" not in d.current_url)
+        except TimeoutException:
+            pass  # Reported as a failed login below
+        
+        # Check if login was successful
+        if "instagram.com" in self.driver.current_url and "login" not in self.driver.current_url:
+            self.logger.info("Successfully logged in to Instagram")
+            self._logged_in = True
             
-            # Click login button
-            login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-            login_button.click()
+            # Handle "Save Your Login Info" popup
+            self._dismiss_dialog()
             
-            # Wait for login to complete
-            time.sleep(5)
+            # Handle notifications popup
+            self._dismiss_dialog()
             
-            # Check if login was successful
-            if "instagram.com" in self.driver.current_url and "login" not in self.driver.current_url:
-                self.logger.info("Successfully logged in to Instagram")
-                
-                # Handle "Save Your Login Info" popup
-                self._handle_save_login_popup()
-                
-                # Handle notifications popup
-                self._handle_notifications_popup()
-                
-                return True
-            else:
-                self.logger.error("Login failed - still on login page")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Error during login: {str(e)}")
+            return True
+        else:
+            self.logger.error("Login failed - still on login page")
             return False
     
     def start_automation(self):
@@ -119,60 +202,103 @@ class InstagramBot:
             self.logger.error("Driver not initialized. Please login first.")
             return
         
+        from engagement import EngagementStrategy
+        
         self.session_start_time = datetime.now()
-        self.engagement = EngagementStrategy(self.driver, self.config, self.logger, self.rate_limiter)
+        self.engagement = EngagementStrategy(self.driver, self.config, self.logger, self.rate_limiter,
+                                             rng=self._rng.spawn(1)[0])
         
+        hashtags = self.config.targeting.target_hashtags
         session_stats = {
             'likes_count': 0,
             'follows_count': 0,
             'comments_count': 0,
-            'target_hashtags': [],
+            'target_hashtags': list(hashtags),
             'success_rate': 0,
             'duration_minutes': 0
         }
         
+        # Keep concurrency low: every worker acts on the same account
+        workers = max(1, min(self.config.safety.parallel_sessions, len(hashtags)))
+        worker_drivers = []
+        
         try:
-            self.logger.info("Starting automation process")
+            self.logger.info("Starting automation process with %d session(s)", workers)
             
-            # Process each target hashtag
-            for hashtag in self.config['targeting']['target_hashtags']:
-                self.logger.info(f"Processing hashtag: {hashtag}")
-                session_stats['target_hashtags'].append(hashtag)
-                
-                # Like posts
-                if random.random() <= self.config['engagement']['like_probability']:
-                    likes = self.engagement.like_posts_by_hashtag(hashtag, max_likes=20)
+            # Hand out one engagement strategy per driver; a WebDriver must not be shared between threads
+            strategies = queue.Queue()
+            strategies.put(self.engagement)
+            for _ in range(workers - 1):
+                driver = self._create_worker_driver()
+                worker_drivers.append(driver)
+                strategies.put(EngagementStrategy(driver, self.config, self.logger, self.rate_limiter,
+                                                  rng=self._rng.spawn(1)[0]))
+            
+            # Draw every hashtag's like/follow decision up front, one row per hashtag
+            probabilities = np.array([self.config.engagement.like_probability,
+                                      self.config.engagement.follow_probability])
+            decisions = self._rng.random((len(hashtags), 2)) < probabilities
+            
+            def run(hashtag: str, decision: np.ndarray) -> Tuple[int, int, int]:
+                engagement = strategies.get()
+                try:
+                    return self._process_hashtag(hashtag, engagement, decision)
+                finally:
+                    strategies.put(engagement)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run, hashtag, decision): hashtag
+                           for hashtag, decision in zip(hashtags, decisions)}
+                for future in as_completed(futures):
+                    try:
+                        likes, follows, comments = future.result()
+                    except Exception as e:
+                        self.logger.error("Error processing hashtag %s: %s", futures[future], e)
+                        continue
                     session_stats['likes_count'] += likes
-                
-                # Follow users
-                if random.random() <= self.config['engagement']['follow_probability']:
-                    follows = self.engagement.follow_users_by_hashtag(hashtag, max_follows=10)
                     session_stats['follows_count'] += follows
-                
-                # Comment on posts
-                if self.config['comments']['enabled']:
-                    comments = self.engagement.comment_on_posts(hashtag, max_comments=5)
                     session_stats['comments_count'] += comments
-                
-                # Wait between hashtags
-                self.rate_limiter.wait_random_delay()
             
             # Calculate session metrics
             total_actions = session_stats['likes_count'] + session_stats['follows_count'] + session_stats['comments_count']
-            session_stats['success_rate'] = (total_actions / len(self.config['targeting']['target_hashtags'])) * 100 if total_actions > 0 else 0
+            session_stats['success_rate'] = (total_actions / len(hashtags)) * 100 if total_actions > 0 else 0
             session_stats['duration_minutes'] = (datetime.now() - self.session_start_time).total_seconds() / 60
             session_stats['target_hashtags'] = ', '.join(session_stats['target_hashtags'])
             
             # Record session analytics
             self.analytics.record_session(session_stats)
             
-            self.logger.info(f"Automation session completed: {session_stats}")
+            self.logger.info("Automation session completed: %s", session_stats)
             
         except Exception as e:
-            self.logger.error(f"Error during automation: {str(e)}")
+            self.logger.error("Error during automation: %s", e)
         
         finally:
-            self._cleanup()
+            for driver in worker_drivers:
+                driver.quit()
+    
+    def _process_hashtag(self, hashtag: str, engagement: 'EngagementStrategy',
+                         decision: np.ndarray) -> Tuple[int, int, int]:
+        """Run the like, follow and comment passes for one hashtag."""
+        self.logger.info("Processing hashtag: %s", hashtag)
+        likes = follows = comments = 0
+        
+        # Like posts
+        if decision[0]:
+            likes = engagement.like_posts_by_hashtag(hashtag, max_likes=20)
+        
+        # Follow users
+        if decision[1]:
+            follows = engagement.follow_users_by_hashtag(hashtag, max_follows=10)
+        
+        # Comment on posts
+        if self.config.comments.enabled:
+            comments = engagement.comment_on_posts(hashtag, max_comments=5)
+        
+        # Wait between hashtags
+        self.rate_limiter.wait_random_delay()
+        
+        return likes, follows, comments
     
     def get_analytics_summary(self) -> Dict[str, Any]:
         """Get analytics summary."""
@@ -187,37 +313,47 @@ class InstagramBot:
         else:
             return {"error": "Invalid report type. Use 'daily' or 'weekly'"}
     
-    def create_performance_charts(self):
+    def create_performance_charts(self, high_dpi: bool = False):
         """Create performance visualization charts."""
-        return self.analytics.create_performance_charts()
+        return self.analytics.create_performance_charts(high_dpi=high_dpi)
     
-    def _handle_save_login_popup(self):
-        """Handle the 'Save Your Login Info' popup."""
-        try:
-            not_now_button = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Not Now')]"))
-            )
-            not_now_button.click()
-            time.sleep(2)
-        except:
-            pass  # Popup might not appear
-    
-    def _handle_notifications_popup(self):
-        """Handle the notifications popup."""
+    def _dismiss_dialog(self, timeout: float = 2) -> bool:
+        """Click the "Not Now" button of a popup, if one shows up within the timeout."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        strategies = [self._NOT_NOW_CLASS_SELECTOR, self._NOT_NOW_TEXT_SCRIPT]
+        if self._not_now_selector:
+            strategies.remove(self._not_now_selector)
+            strategies.insert(0, self._not_now_selector)
+        
+        def find_button(driver):
+            for strategy in strategies:
+                if strategy is self._NOT_NOW_TEXT_SCRIPT:
+                    button = driver.execute_script(strategy)
+                else:
+                    button = next(iter(driver.find_elements(By.CSS_SELECTOR, strategy)), None)
+                if button:
+                    self._not_now_selector = strategy
+                    return button
+            return False
+        
         try:
-            not_now_button = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Not Now')]"))
-            )
-            not_now_button.click()
-            time.sleep(2)
-        except:
-            pass  # Popup might not appear
-    
-    def _cleanup(self):
-        """Clean up resources."""
+            WebDriverWait(self.driver, timeout).until(find_button).click()
+            return True
+        except Exception:
+            return False  # Popup might not appear
+    
+    def shutdown(self):
+        """Flush analytics and close the WebDriver; the next login starts a fresh browser."""
+        self.analytics._flush_all()
+        self.rate_limiter.flush_state()
         if self.driver:
             self.driver.quit()
+            self.driver = None
+            self._logged_in = False
             self.logger.info("WebDriver closed")
+        self.logger.flush()
     
     def __enter__(self):
         """Context manager entry."""
@@ -225,7 +361,7 @@ class InstagramBot:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self._cleanup()
+        self.shutdown()
 
 # Example usage
 if __name__ == "__main__":
@@ -250,4 +386,4 @@ if __name__ == "__main__":
         print(f"Error: {e}")
     
     finally:
-        bot._cleanup()
\ No newline at end of file
+        bot.shutdown()
\ No newline at end of file
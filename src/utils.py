@@ -1,137 +1,500 @@
-import json
+import asyncio
+import atexit
+import csv
+import functools
+import orjson
 import time
 import random
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import logging.handlers
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterator, List, Dict, Any, Optional, Tuple, Type
 import os
 
+@dataclass(frozen=True, slots=True)
+class CredentialsCfg:
+    username: str
+    password: str
+
+@dataclass(frozen=True, slots=True)
+class TargetingCfg:
+    target_hashtags: Tuple[str, ...]
+    target_locations: Tuple[str, ...] = ()
+    blacklist_users: Tuple[str, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class LimitsCfg:
+    daily_follows: int
+    daily_unfollows: int
+    daily_likes: int
+    daily_comments: int
+    hourly_actions: int
+    window_seconds: int = 24 * 60 * 60  # Span the daily_* limits are enforced over
+
+@dataclass(frozen=True, slots=True)
+class DelaysCfg:
+    min_delay: float
+    max_delay: float
+    action_delay: float
+
+@dataclass(frozen=True, slots=True)
+class EngagementCfg:
+    like_probability: float
+    comment_probability: float
+    follow_probability: float
+    unfollow_after_days: int = 3
+    random_seed: Optional[int] = None  # Set to replay the same engagement decisions
+
+@dataclass(frozen=True, slots=True)
+class CommentsCfg:
+    enabled: bool = False
+    templates: Tuple[str, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class SafetyCfg:
+    headless_mode: bool
+    use_proxy: bool
+    user_agent_rotation: bool
+    proxy_list: Tuple[str, ...] = ()
+    parallel_sessions: int = 1
+
+@dataclass(frozen=True, slots=True)
+class AnalyticsCfg:
+    track_engagement: bool = True
+    save_logs: bool = True
+    generate_reports: bool = True
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable bot configuration, one attribute per config.json section."""
+    credentials: CredentialsCfg
+    targeting: TargetingCfg
+    limits: LimitsCfg
+    delays: DelaysCfg
+    engagement: EngagementCfg
+    safety: SafetyCfg
+    comments: CommentsCfg = field(default_factory=CommentsCfg)
+    analytics: AnalyticsCfg = field(default_factory=AnalyticsCfg)
+
 class ConfigManager:
     """Manages configuration loading and validation."""
     
     @staticmethod
-    def load_config(config_path: str = "config/config.json") -> Dict[str, Any]:
+    def load_config(config_path: str = "config/config.json") -> Config:
         """Load configuration from JSON file."""
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            with open(config_path, 'rb') as f:
+                raw = orjson.loads(f.read())
         except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {config_path}")
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             raise ValueError(f"Invalid JSON in config file: {config_path}")
+        
+        try:
+            return ConfigManager.parse_config(raw)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid config in {config_path}: {e}")
+    
+    @staticmethod
+    def parse_config(raw: Dict[str, Any]) -> Config:
+        """Build a Config from the raw JSON dictionary."""
+        sections = {}
+        for name, section_cls in Config.__annotations__.items():
+            if name in raw:
+                # Lists become tuples so the frozen config stays immutable
+                sections[name] = section_cls(**{
+                    key: tuple(value) if isinstance(value, list) else value
+                    for key, value in raw[name].items()
+                })
+        return Config(**sections)
+
+# File buffer attached by the first Logger; later Loggers share it
+_file_buffer: Optional[logging.handlers.MemoryHandler] = None
+_logging_lock = threading.Lock()
+
+def _configure_logging(log_file: str) -> logging.handlers.MemoryHandler:
+    """Attach the bot's log handlers on first use and return the attached file buffer.
+    
+    Later calls return the same buffer whatever log_file they pass, so only one file is written.
+    """
+    global _file_buffer
+    with _logging_lock:
+        if _file_buffer is not None:
+            return _file_buffer
+        
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        
+        log_format = '%(asctime)s - %(levelname)s - %(message)s'
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(logging.Formatter(log_format))
+        
+        # Batch file writes; errors still reach the file immediately
+        file_buffer = logging.handlers.MemoryHandler(
+            capacity=100, flushLevel=logging.ERROR, target=file_handler
+        )
+        
+        root = logging.getLogger()
+        if root.handlers:
+            # Logging was set up elsewhere and basicConfig would be a no-op; attach to our logger instead
+            bot_logger = logging.getLogger("ig_bot")
+            bot_logger.setLevel(logging.INFO)
+            bot_logger.addHandler(file_buffer)
+        else:
+            logging.basicConfig(
+                level=logging.INFO,
+                format=log_format,
+                handlers=[
+                    file_buffer,
+                    logging.StreamHandler()
+                ]
+            )
+        
+        atexit.register(file_buffer.flush)
+        _file_buffer = file_buffer
+        return file_buffer
 
 class Logger:
     """Custom logger for Instagram bot activities."""
     
     def __init__(self, log_file: str = "data/logs/bot_activity.log"):
         self.log_file = log_file
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        self._file_buffer = _configure_logging(log_file)
+        self.logger = logging.getLogger("ig_bot")
     
-    def info(self, message: str):
-        self.logger.info(message)
+    def flush(self):
+        """Write any buffered log records to the log file."""
+        self._file_buffer.flush()
     
-    def warning(self, message: str):
-        self.logger.warning(message)
+    def debug(self, message: str, *args):
+        self.logger.debug(message, *args)
     
-    def error(self, message: str):
-        self.logger.error(message)
+    def info(self, message: str, *args):
+        self.logger.info(message, *args)
+    
+    def warning(self, message: str, *args):
+        self.logger.warning(message, *args)
+    
+    def error(self, message: str, *args):
+        self.logger.error(message, *args)
+
+class ActionTicket:
+    """Slot reserved through RateLimiter.action_slot; only committed tickets count against the limit."""
+    
+    __slots__ = ('_limiter', 'action_type', 'granted', 'committed')
+    
+    def __init__(self, limiter: 'RateLimiter', action_type: str, granted: bool):
+        self._limiter = limiter
+        self.action_type = action_type
+        self.granted = granted
+        self.committed = False
+    
+    def commit(self):
+        """Count the action; call once the interaction actually changed something."""
+        if self.granted and not self.committed:
+            self.committed = True
+            self._limiter._commit_slot(self.action_type)
 
 class RateLimiter:
     """Manages rate limiting and delays."""
     
-    def __init__(self, config: Dict[str, Any]):
+    # Granularity of the sliding window; actions within one bucket expire together
+    BUCKET_SECONDS = 60
+    # Recorded actions between writes of the persisted window
+    STATE_FLUSH_EVERY = 10
+    
+    def __init__(self, config: Config, state_path: str = "data/rate_limit_state.json"):
         self.config = config
+        self.window_seconds = config.limits.window_seconds
+        self._state_path = state_path
+        self._dirty_count = 0
+        
+        # Running totals over the window, kept in step with the per-type (bucket_ts, count) deques
         self.action_counts = {
             'likes': 0,
             'follows': 0,
             'unfollows': 0,
             'comments': 0
         }
-        self.last_reset = datetime.now()
+        self._buckets: Dict[str, Deque[Tuple[int, int]]] = {key: deque() for key in self.action_counts}
+        # Time at which the oldest bucket of each type leaves the window; until then expiry is a no-op
+        self._next_expiry = {key: 0.0 for key in self.action_counts}
+        self._limits = {
+            'likes': config.limits.daily_likes,
+            'follows': config.limits.daily_follows,
+            'unfollows': config.limits.daily_unfollows,
+            'comments': config.limits.daily_comments
+        }
+        self._lock = threading.Lock()
+        # Serializes state writes so an older snapshot never replaces a newer one
+        self._state_write_lock = threading.Lock()
+        
+        # Carry the window over from earlier runs so a restart does not reset the limits
+        self._restore_state()
+        atexit.register(self.flush_state)
     
     def can_perform_action(self, action_type: str) -> bool:
         """Check if action can be performed within limits."""
-        self._reset_daily_counts()
-        
-        limits = {
-            'likes': self.config['limits']['daily_likes'],
-            'follows': self.config['limits']['daily_follows'],
-            'unfollows': self.config['limits']['daily_unfollows'],
-            'comments': self.config['limits']['daily_comments']
-        }
-        
-        return self.action_counts[action_type] < limits[action_type]
+        with self._lock:
+            self._expire_buckets(action_type, int(time.time()))
+            return self.action_counts[action_type] < self._limits[action_type]
     
     def record_action(self, action_type: str):
         """Record an action and increment counter."""
-        self.action_counts[action_type] += 1
+        now = int(time.time())
+        with self._lock:
+            self._expire_buckets(action_type, now)
+            flush_due = self._add_to_bucket(action_type, now)
+            self.action_counts[action_type] += 1
+        if flush_due:
+            self.flush_state()
+    
+    @contextmanager
+    def action_slot(self, action_type: str) -> Iterator[ActionTicket]:
+        """Reserve room for one action; the reservation is released unless the ticket is committed.
+        
+        Checking and reserving happen under one lock, so parallel sessions cannot overshoot a limit.
+        Check ticket.granted before acting.
+        """
+        with self._lock:
+            self._expire_buckets(action_type, int(time.time()))
+            granted = self.action_counts[action_type] < self._limits[action_type]
+            if granted:
+                self.action_counts[action_type] += 1
+        
+        ticket = ActionTicket(self, action_type, granted)
+        try:
+            yield ticket
+        finally:
+            if granted and not ticket.committed:
+                with self._lock:
+                    self.action_counts[action_type] -= 1
+    
+    def _commit_slot(self, action_type: str):
+        """Turn a reservation into a recorded action; its count was already added when reserving."""
+        with self._lock:
+            flush_due = self._add_to_bucket(action_type, int(time.time()))
+        if flush_due:
+            self.flush_state()
+    
+    def _add_to_bucket(self, action_type: str, now: int) -> bool:
+        """Count one action in the current bucket and report whether the state should be persisted.
+        
+        The caller holds the lock.
+        """
+        bucket_ts = now - now % self.BUCKET_SECONDS
+        buckets = self._buckets[action_type]
+        if buckets and buckets[-1][0] == bucket_ts:
+            buckets[-1] = (bucket_ts, buckets[-1][1] + 1)
+        else:
+            if not buckets:
+                self._next_expiry[action_type] = bucket_ts + self.BUCKET_SECONDS + self.window_seconds
+            buckets.append((bucket_ts, 1))
+        self._dirty_count += 1
+        return self._dirty_count >= self.STATE_FLUSH_EVERY
+    
+    def flush_state(self):
+        """Write the current window buckets to disk if any action was recorded since the last write."""
+        with self._state_write_lock:
+            with self._lock:
+                if not self._dirty_count:
+                    return
+                state = {key: [list(bucket) for bucket in buckets] for key, buckets in self._buckets.items()}
+                self._dirty_count = 0
+            DataManager.save_to_json({'buckets': state}, self._state_path)
+    
+    def _restore_state(self):
+        """Load window buckets persisted by an earlier run, dropping any that have expired."""
+        try:
+            state = DataManager.load_from_json(self._state_path)
+        except ValueError as e:
+            logging.getLogger("ig_bot").warning("Ignoring unreadable rate-limit state: %s", e)
+            return
+        
+        saved = state.get('buckets') if isinstance(state, dict) else None
+        if not isinstance(saved, dict):
+            return
+        
+        now = int(time.time())
+        for key, buckets in saved.items():
+            if key not in self._buckets or not isinstance(buckets, list):
+                continue
+            # Keep well-formed [bucket_ts, count] pairs only, oldest first as the deque expects
+            valid = sorted(
+                (bucket[0], bucket[1]) for bucket in buckets
+                if isinstance(bucket, list) and len(bucket) == 2
+                and all(type(value) is int for value in bucket) and bucket[1] > 0
+            )
+            for bucket_ts, count in valid:
+                self._buckets[key].append((bucket_ts, count))
+                self.action_counts[key] += count
+            self._expire_buckets(key, now)
     
     def wait_random_delay(self):
         """Wait for a random delay between actions."""
-        min_delay = self.config['delays']['min_delay']
-        max_delay = self.config['delays']['max_delay']
-        delay = random.randint(min_delay, max_delay)
-        time.sleep(delay)
+        time.sleep(self._random_delay())
     
-    def _reset_daily_counts(self):
-        """Reset counters if a new day has started."""
-        if datetime.now() - self.last_reset > timedelta(days=1):
-            self.action_counts = {key: 0 for key in self.action_counts}
-            self.last_reset = datetime.now()
+    async def wait_random_delay_async(self):
+        """Wait for a random delay between actions without blocking the event loop."""
+        await asyncio.sleep(self._random_delay())
+    
+    def _random_delay(self) -> float:
+        """Draw a delay in seconds; fractional jitter avoids whole-second timing patterns."""
+        return random.uniform(self.config.delays.min_delay, self.config.delays.max_delay)
+    
+    def _expire_buckets(self, action_type: str, now: int):
+        """Drop buckets that have slid out of the window; the caller holds the lock."""
+        if now < self._next_expiry[action_type]:
+            return
+        
+        cutoff = now - self.window_seconds
+        buckets = self._buckets[action_type]
+        while buckets and buckets[0][0] + self.BUCKET_SECONDS <= cutoff:
+            self.action_counts[action_type] -= buckets.popleft()[1]
+        
+        # Nothing left to expire until the new oldest bucket ages out
+        self._next_expiry[action_type] = (
+            buckets[0][0] + self.BUCKET_SECONDS + self.window_seconds if buckets else float('inf')
+        )
 
 class DataManager:
     """Manages data storage and retrieval."""
     
     @staticmethod
     def save_to_json(data: Dict[str, Any], filepath: str):
-        """Save data to JSON file."""
+        """Save data to a JSON file, replacing it atomically."""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        payload = orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'wb', buffering=1 << 16) as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
     
     @staticmethod
     def load_from_json(filepath: str) -> Dict[str, Any]:
         """Load data from JSON file."""
         try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                return orjson.loads(f.read())
         except FileNotFoundError:
             return {}
     
     @staticmethod
     def append_to_csv(data: List[Dict[str, Any]], filepath: str):
         """Append data to CSV file."""
-        import pandas as pd
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        df = pd.DataFrame(data)
-        if os.path.exists(filepath):
-            df.to_csv(filepath, mode='a', header=False, index=False)
-        else:
-            df.to_csv(filepath, index=False)
+        if not data:
+            return
+        
+        with open(filepath, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(data[0]))
+            # A fresh handle opened for append sits at the end, so position 0 means an empty file
+            if f.tell() == 0:
+                writer.writeheader()
+            writer.writerows(data)
+    
+    @staticmethod
+    def save_to_parquet(df, filepath: str):
+        """Save a DataFrame to a Parquet file, replacing it atomically."""
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_path = f"{filepath}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, filepath)
+    
+    @staticmethod
+    def load_from_parquet(filepath: str):
+        """Load a DataFrame from a Parquet file."""
+        import pandas as pd
+        return pd.read_parquet(filepath)
+
+# Desktop Chrome user agents (reduced UA format), newest releases first
+_USER_AGENTS: Tuple[str, ...] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+)
+
+def retry_with_backoff(max_attempts: int = 3, base: float = 1.0,
+                       exceptions: Tuple[Type[BaseException], ...] = (Exception,)) -> Callable:
+    """Retry the decorated call on the given exceptions, sleeping base * 2**attempt plus jitter in between."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return func(*args, **kwargs)
+                except exceptions as e:
+                    if attempt == max_attempts - 1:
+                        raise
+                    delay = base * 2 ** attempt + random.uniform(0, base)
+                    logging.getLogger("ig_bot").warning(
+                        "%s failed (%s), retrying in %.1fs", func.__name__, e, delay
+                    )
+                    time.sleep(delay)
+        return wrapper
+    return decorator
 
 def get_random_user_agent() -> str:
     """Get a random user agent string."""
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    ]
-    return random.choice(user_agents)
+    return random.choice(_USER_AGENTS)
 
+@functools.lru_cache(maxsize=2048)
 def validate_hashtag(hashtag: str) -> str:
     """Validate and format hashtag."""
-    hashtag = hashtag.strip()
-    if not hashtag.startswith('#'):
-        hashtag = '#' + hashtag
-    return hashtag.lower()
\ No newline at end of file
+    hashtag = hashtag.strip().lower()
+    return hashtag if hashtag[:1] == '#' else '#' + hashtag
\ No newline at end of file